@@ -1,317 +1,496 @@
-from datetime import timedelta
-from typing import Awaitable, Callable
-
-import anyio
-from loguru import logger
-import mcp.types as types
-from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
-from mcp.shared.session import BaseSession, RequestResponder
-from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
-from pydantic import AnyUrl
-
-from mcp_bridge import __version__ as version
-from mcp_bridge.sampling.sampler import handle_sampling_message
-# Fix the import - import the functions before using them
-from mcp_bridge.utils.message_adapter import wrap_message
-
-sampling_function_signature = Callable[
-    [types.CreateMessageRequestParams], Awaitable[types.CreateMessageResult]
-]
-
-class McpClientSession(
-    BaseSession[
-        types.ClientRequest,
-        types.ClientNotification,
-        types.ClientResult,
-        types.ServerRequest,
-        types.ServerNotification,
-    ]
-):
-
-
-
-    def __init__(
-        self,
-        read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception],
-        write_stream: MemoryObjectSendStream[types.JSONRPCMessage],
-        read_timeout_seconds: timedelta | None = None,
-    ) -> None:
-        super().__init__(
-            read_stream,
-            write_stream,
-            types.ServerRequest,
-            types.ServerNotification,
-            read_timeout_seconds=read_timeout_seconds,
-        )
-        self._read_stream = read_stream
-        self.incoming_messages = read_stream
-        self._incoming_messages = read_stream
-        # self.incoming_messages = read_stream
-        # print(f"self.incoming_messages: {self.incoming_messages}")
-        # print(f"self._incoming_messages: {self._incoming_messages}")
-
-    async def __aenter__(self):
-        session = await super().__aenter__()
-        if not hasattr(self, 'incoming_messages') or self.incoming_messages is None:
-            self.incoming_messages = self._read_stream
-            self._incoming_messages = self._read_stream
-            logger.debug(f"SETTING self.incoming_messages: {self.incoming_messages}")
-        self._task_group.start_soon(self._consume_messages)
-        return session
-
-    async def _consume_messages(self):
-        """
-        Process messages from the incoming message stream, with robust error handling.
-        """
-        logger.info(f"McpClientSession has incoming_messages: {hasattr(self, 'incoming_messages')}")
-        if hasattr(self, 'incoming_messages') and self.incoming_messages is not None:
-            logger.info(f"incoming_messages type: {type(self.incoming_messages)}")
-        else:
-            logger.warning("incoming_messages not found or is None")
-            return
-            
-        try:
-            async for original_message in self.incoming_messages:
-                try:
-                    # Wrap the message
-                    message = wrap_message(original_message)
-                    
-                    if isinstance(message, Exception):
-                        logger.error(f"Received exception in message stream: {message}")
-                    elif hasattr(message, 'request'):  # For RequestResponder
-                        logger.debug(f"Received request: {message.request}")
-                        try:
-                            await self._received_request(message)
-                        except Exception as req_err:
-                            logger.exception(f"Error handling request: {req_err}")
-                    elif hasattr(message, 'root'):
-                        if hasattr(message.root, 'params') and hasattr(types, 'LoggingMessageNotification') and hasattr(types, 'ServerNotification') and isinstance(message, types.ServerNotification) and isinstance(message.root, types.LoggingMessageNotification):
-                            logger.debug(f"Received notification from server: {message.root.params}")                        
-                        else:
-                            logger.debug(f"Received notification from server: {message}")                        
-                    else:
-                        logger.debug(f"Received message: {message}")
-                except anyio.ClosedResourceError:
-                    logger.debug("Message stream closed")
-                    break
-                except Exception as e:
-                    logger.exception(f"Error processing message: {e}")
-        except anyio.ClosedResourceError:
-            logger.debug("Message stream closed")
-        except Exception as e:
-            logger.exception(f"Message consumer task failed: {e}")
-
-    async def initialize(self) -> types.InitializeResult:
-        result = await self.send_request(
-            types.ClientRequest(
-                types.InitializeRequest(
-                    method="initialize",
-                    params=types.InitializeRequestParams(
-                        protocolVersion=types.LATEST_PROTOCOL_VERSION,
-                        capabilities=types.ClientCapabilities(
-                            sampling=types.SamplingCapability(),
-                            experimental=None,
-                            roots=types.RootsCapability(
-                                listChanged=True
-                            ),
-                        ),
-                        clientInfo=types.Implementation(name="MCP-Bridge", version=version),
-                    ),
-                )
-            ),
-            types.InitializeResult,
-        )
-
-        if result.protocolVersion not in SUPPORTED_PROTOCOL_VERSIONS:
-            raise RuntimeError(
-                "Unsupported protocol version from the server: "
-                f"{result.protocolVersion}"
-            )
-
-        await self.send_notification(
-            types.ClientNotification(
-                types.InitializedNotification(method="notifications/initialized")
-            )
-        )
-
-        return result
-
-    async def send_ping(self) -> types.EmptyResult:
-        """Send a ping request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.PingRequest(
-                    method="ping",
-                )
-            ),
-            types.EmptyResult,
-        )
-
-    async def send_progress_notification(
-        self, progress_token: str | int, progress: float, total: float | None = None
-    ) -> None:
-        """Send a progress notification."""
-        await self.send_notification(
-            types.ClientNotification(
-                types.ProgressNotification(
-                    method="notifications/progress",
-                    params=types.ProgressNotificationParams(
-                        progressToken=progress_token,
-                        progress=progress,
-                        total=total,
-                    ),
-                ),
-            )
-        )
-
-    async def set_logging_level(self, level: types.LoggingLevel) -> types.EmptyResult:
-        """Send a logging/setLevel request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.SetLevelRequest(
-                    method="logging/setLevel",
-                    params=types.SetLevelRequestParams(level=level),
-                )
-            ),
-            types.EmptyResult,
-        )
-
-    async def list_resources(self) -> types.ListResourcesResult:
-        """Send a resources/list request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.ListResourcesRequest(
-                    method="resources/list",
-                )
-            ),
-            types.ListResourcesResult,
-        )
-
-    async def read_resource(self, uri: AnyUrl) -> types.ReadResourceResult:
-        """Send a resources/read request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.ReadResourceRequest(
-                    method="resources/read",
-                    params=types.ReadResourceRequestParams(uri=uri),
-                )
-            ),
-            types.ReadResourceResult,
-        )
-
-    async def subscribe_resource(self, uri: AnyUrl) -> types.EmptyResult:
-        """Send a resources/subscribe request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.SubscribeRequest(
-                    method="resources/subscribe",
-                    params=types.SubscribeRequestParams(uri=uri),
-                )
-            ),
-            types.EmptyResult,
-        )
-
-    async def unsubscribe_resource(self, uri: AnyUrl) -> types.EmptyResult:
-        """Send a resources/unsubscribe request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.UnsubscribeRequest(
-                    method="resources/unsubscribe",
-                    params=types.UnsubscribeRequestParams(uri=uri),
-                )
-            ),
-            types.EmptyResult,
-        )
-
-    async def call_tool(
-        self, name: str, arguments: dict | None = None
-    ) -> types.CallToolResult:
-        """Send a tools/call request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.CallToolRequest(
-                    method="tools/call",
-                    params=types.CallToolRequestParams(name=name, arguments=arguments),
-                )
-            ),
-            types.CallToolResult,
-        )
-
-    async def list_prompts(self) -> types.ListPromptsResult:
-        """Send a prompts/list request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.ListPromptsRequest(
-                    method="prompts/list",
-                )
-            ),
-            types.ListPromptsResult,
-        )
-
-    async def get_prompt(
-        self, name: str, arguments: dict[str, str] | None = None
-    ) -> types.GetPromptResult:
-        """Send a prompts/get request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.GetPromptRequest(
-                    method="prompts/get",
-                    params=types.GetPromptRequestParams(name=name, arguments=arguments),
-                )
-            ),
-            types.GetPromptResult,
-        )
-
-    async def complete(
-        self, ref: types.ResourceReference | types.PromptReference, argument: dict
-    ) -> types.CompleteResult:
-        """Send a completion/complete request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.CompleteRequest(
-                    method="completion/complete",
-                    params=types.CompleteRequestParams(
-                        ref=ref,
-                        argument=types.CompletionArgument(**argument),
-                    ),
-                )
-            ),
-            types.CompleteResult,
-        )
-
-    async def list_tools(self) -> types.ListToolsResult:
-        """Send a tools/list request."""
-        return await self.send_request(
-            types.ClientRequest(
-                types.ListToolsRequest(
-                    method="tools/list",
-                )
-            ),
-            types.ListToolsResult,
-        )
-
-    async def send_roots_list_changed(self) -> None:
-        """Send a roots/list_changed notification."""
-        await self.send_notification(
-            types.ClientNotification(
-                types.RootsListChangedNotification(
-                    method="notifications/roots/list_changed",
-                )
-            )
-        )
-
-    async def _received_request(
-        self, responder: RequestResponder["types.ServerRequest", "types.ClientResult"]
-    ) -> None:
-        if isinstance(responder.request.root, types.CreateMessageRequest):
-            # handle create message request (sampling)
-            response = await self.sample(responder.request.root.params)
-            client_response = types.ClientResult(**response.model_dump())
-            await responder.respond(client_response)
-
-    async def sample(self, params: types.CreateMessageRequestParams) -> types.CreateMessageResult:
-        logger.info("got sampling request from mcp server")
-        resp = await handle_sampling_message(params)
-        logger.info("finished sampling request from mcp server")
-        return resp
+import asyncio
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+import anyio
+from loguru import logger
+import mcp.types as types
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.shared.session import BaseSession, RequestResponder
+from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+from pydantic import AnyUrl
+
+from mcp_bridge import __version__ as version
+from mcp_bridge.sampling.sampler import handle_sampling_message
+
+sampling_function_signature = Callable[
+    [types.CreateMessageRequestParams], Awaitable[types.CreateMessageResult]
+]
+
+# hoisted so the hot loop does not re-resolve these attributes per message
+_ServerNotification = types.ServerNotification
+_LoggingMessageNotification = types.LoggingMessageNotification
+
+# frozenset gives O(1) membership for the version handshake check
+_SUPPORTED_PROTOCOL_VERSIONS = frozenset(SUPPORTED_PROTOCOL_VERSIONS)
+
+# prebound converter for the sampling response path
+_client_result_construct = types.ClientResult.model_construct
+
+class McpClientSession(
+    BaseSession[
+        types.ClientRequest,
+        types.ClientNotification,
+        types.ClientResult,
+        types.ServerRequest,
+        types.ServerNotification,
+    ]
+):
+
+    # BaseSession carries no __slots__, so instances keep a __dict__ either
+    # way; empty slots avoid stacking unused slot cells on top of it and
+    # leave any base-class attributes untouched
+    __slots__ = ()
+
+    # parameterless payloads are immutable, so build each pydantic model
+    # graph once at class definition time instead of on every call
+    _PING_REQ = types.ClientRequest(types.PingRequest(method="ping"))
+    _LIST_TOOLS_REQ = types.ClientRequest(types.ListToolsRequest(method="tools/list"))
+    _LIST_PROMPTS_REQ = types.ClientRequest(types.ListPromptsRequest(method="prompts/list"))
+    _LIST_RESOURCES_REQ = types.ClientRequest(types.ListResourcesRequest(method="resources/list"))
+    _ROOTS_CHANGED_NOTIF = types.ClientNotification(
+        types.RootsListChangedNotification(method="notifications/roots/list_changed")
+    )
+    # the handshake payload only depends on values known at import time
+    _INITIALIZE_REQ = types.ClientRequest(
+        types.InitializeRequest(
+            method="initialize",
+            params=types.InitializeRequestParams(
+                protocolVersion=types.LATEST_PROTOCOL_VERSION,
+                capabilities=types.ClientCapabilities(
+                    sampling=types.SamplingCapability(),
+                    experimental=None,
+                    roots=types.RootsCapability(
+                        listChanged=True
+                    ),
+                ),
+                clientInfo=types.Implementation(name="MCP-Bridge", version=version),
+            ),
+        )
+    )
+    _INITIALIZED_NOTIF = types.ClientNotification(
+        types.InitializedNotification(method="notifications/initialized")
+    )
+
+    def __init__(
+        self,
+        read_stream: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception],
+        write_stream: MemoryObjectSendStream[types.JSONRPCMessage],
+        read_timeout_seconds: timedelta | None = None,
+    ) -> None:
+        super().__init__(
+            read_stream,
+            write_stream,
+            types.ServerRequest,
+            types.ServerNotification,
+            read_timeout_seconds=read_timeout_seconds,
+        )
+        # outgoing requests are coalesced into batches by _drain_request_queue
+        self._max_batch = 32
+        self._request_queue: asyncio.Queue[
+            tuple[types.ClientRequest, type, asyncio.Future]
+        ] = asyncio.Queue()
+
+        # bind once so the dispatch hot path skips the per-call MRO lookup
+        self._send_request = self.send_request
+
+        # at most this many sampling handlers run at once; the consumer
+        # acquires before spawning, so a saturated sampler backpressures the
+        # read stream instead of piling up unbounded tasks
+        self._max_concurrent_sampling = 8
+        self._sampling_semaphore = asyncio.Semaphore(self._max_concurrent_sampling)
+
+        # progress updates are throttled per token; intermediates landing
+        # inside the window are dropped in favour of the latest value
+        self._progress_window_ms = 50
+        self._pending_progress: dict[str | int, tuple[float, float | None]] = {}
+        self._progress_last_sent: dict[str | int, float] = {}
+
+        # items forwarded by _receive_loop are queued here and processed in
+        # batches by _consume_incoming; the bound makes a stalled consumer
+        # backpressure the receive loop instead of buffering without limit
+        self._incoming_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self._max_batch)
+
+        # type-keyed dispatch for _consume_incoming; subclasses are memoized
+        # into this dict by _resolve_message_handler on first sight
+        self._message_handlers: dict[type, Callable] = {
+            RequestResponder: self._handle_request_msg,
+            _ServerNotification: self._handle_notification_msg,
+            Exception: self._handle_exception_msg,
+        }
+
+    async def __aenter__(self):
+        session = await super().__aenter__()
+        self._task_group.start_soon(self._consume_incoming)
+        self._task_group.start_soon(self._drain_request_queue)
+        self._task_group.start_soon(self._flush_progress_loop)
+        return session
+
+    async def send_requests_batched(self, request, result_type):
+        """Queue a request for batched dispatch and wait for its result.
+
+        Concurrent callers whose requests are queued together are swept up
+        and dispatched in one pass by _drain_request_queue instead of
+        serially round-tripping one request at a time.
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._request_queue.put((request, result_type, future))
+        return await future
+
+    def _drain_ready_requests(self, batch: list) -> None:
+        """Pull everything already sitting in the queue without awaiting."""
+        while len(batch) < self._max_batch:
+            try:
+                batch.append(self._request_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    async def _drain_request_queue(self):
+        """Coalesce queued requests and dispatch each batch without waiting."""
+        while True:
+            batch = [await self._request_queue.get()]
+
+            # sweep whatever else is already queued; a lone request is
+            # dispatched immediately rather than held for a batch window
+            # waiting on a peer that may never arrive
+            self._drain_ready_requests(batch)
+
+            if len(batch) > 1:
+                logger.debug(f"dispatching batch of {len(batch)} requests")
+
+            # spawn into the session task group and loop straight away so a
+            # slow round trip in this batch cannot head-of-line block the next
+            for request, result_type, future in batch:
+                self._task_group.start_soon(
+                    self._dispatch_batched, request, result_type, future
+                )
+
+    async def _dispatch_batched(
+        self, request: types.ClientRequest, result_type: type, future: asyncio.Future
+    ) -> None:
+        try:
+            result = await self._send_request(request, result_type)
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _handle_incoming(self, req) -> None:
+        """Queue an item forwarded by BaseSession._receive_loop.
+
+        The receive loop owns the raw read stream; uncompleted responders,
+        typed server notifications and stream errors all land here and are
+        processed in batches by _consume_incoming.
+        """
+        await self._incoming_queue.put(req)
+
+    async def _consume_incoming(self):
+        """Process queued incoming items, draining each burst in one pass."""
+        try:
+            while True:
+                batch = [await self._incoming_queue.get()]
+
+                # grab whatever else is already queued without awaiting, so a
+                # burst costs one wakeup instead of one per item
+                while len(batch) < self._max_batch:
+                    try:
+                        batch.append(self._incoming_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+
+                await self._process_message_batch(batch)
+        except Exception as e:
+            logger.exception(f"Incoming message consumer failed: {e}")
+
+    async def _process_message_batch(self, batch):
+        """Handle a batch of incoming items, coalescing log notifications."""
+        pending_log_params: list = []
+        handlers = self._message_handlers
+
+        for req in batch:
+            try:
+                handler = handlers.get(type(req))
+                if handler is None:
+                    handler = self._resolve_message_handler(type(req))
+                await handler(req, pending_log_params)
+            except Exception as e:
+                logger.exception(f"Error processing message: {e}")
+
+        if pending_log_params:
+            # repr of the params list is expensive, only build it when DEBUG
+            # is actually enabled
+            logger.opt(lazy=True).debug(
+                "Received {} log notifications from server: {}",
+                lambda: len(pending_log_params),
+                lambda: pending_log_params,
+            )
+
+    def _resolve_message_handler(self, message_type: type) -> Callable:
+        """Find the handler for a message type via its MRO and memoize it."""
+        for base in message_type.__mro__:
+            handler = self._message_handlers.get(base)
+            if handler is not None:
+                self._message_handlers[message_type] = handler
+                return handler
+
+        self._message_handlers[message_type] = self._handle_default_msg
+        return self._handle_default_msg
+
+    async def _handle_exception_msg(self, message, pending_log_params) -> None:
+        logger.error(f"Received exception in message stream: {message}")
+
+    async def _handle_request_msg(self, responder, pending_log_params) -> None:
+        logger.opt(lazy=True).debug("Received request: {}", lambda: responder.request)
+        if isinstance(responder.request.root, types.CreateMessageRequest):
+            # sampling can take seconds; run it in the session task group so
+            # incoming messages keep flowing while we wait on the LLM
+            await self._sampling_semaphore.acquire()
+            self._task_group.start_soon(self._handle_sampling_request, responder)
+
+    async def _handle_notification_msg(self, message, pending_log_params) -> None:
+        root = message.root
+        if isinstance(root, _LoggingMessageNotification):
+            pending_log_params.append(root.params)
+        else:
+            logger.opt(lazy=True).debug("Received notification from server: {}", lambda: message)
+
+    async def _handle_default_msg(self, message, pending_log_params) -> None:
+        logger.opt(lazy=True).debug("Received message: {}", lambda: message)
+
+    async def initialize(self) -> types.InitializeResult:
+        result = await self.send_request(self._INITIALIZE_REQ, types.InitializeResult)
+
+        if result.protocolVersion not in _SUPPORTED_PROTOCOL_VERSIONS:
+            raise RuntimeError(
+                "Unsupported protocol version from the server: "
+                f"{result.protocolVersion}"
+            )
+
+        await self.send_notification(self._INITIALIZED_NOTIF)
+
+        return result
+
+    async def send_ping(self) -> types.EmptyResult:
+        """Send a ping request."""
+        return await self._send_request(self._PING_REQ, types.EmptyResult)
+
+    async def send_progress_notification(
+        self, progress_token: str | int, progress: float, total: float | None = None
+    ) -> None:
+        """Send a progress notification, coalescing rapid updates.
+
+        Updates arriving within the progress window are not sent
+        immediately; only the latest value per token is kept and
+        _flush_progress_loop emits it once the window elapses.
+        """
+        now = time.monotonic()
+        last_sent = self._progress_last_sent.get(progress_token, 0.0)
+
+        if now - last_sent < self._progress_window_ms / 1000:
+            self._pending_progress[progress_token] = (progress, total)
+            return
+
+        self._pending_progress.pop(progress_token, None)
+        self._progress_last_sent[progress_token] = now
+        await self._send_progress(progress_token, progress, total)
+
+    async def _send_progress(
+        self, progress_token: str | int, progress: float, total: float | None
+    ) -> None:
+        await self.send_notification(
+            types.ClientNotification(
+                types.ProgressNotification(
+                    method="notifications/progress",
+                    params=types.ProgressNotificationParams(
+                        progressToken=progress_token,
+                        progress=progress,
+                        total=total,
+                    ),
+                ),
+            )
+        )
+
+    async def _flush_progress_loop(self):
+        """Periodically send the latest coalesced progress update per token."""
+        window = self._progress_window_ms / 1000
+        while True:
+            await anyio.sleep(window)
+            now = time.monotonic()
+
+            for token in list(self._pending_progress):
+                if now - self._progress_last_sent.get(token, 0.0) < window:
+                    continue
+                progress, total = self._pending_progress.pop(token)
+                self._progress_last_sent[token] = now
+                await self._send_progress(token, progress, total)
+
+            # tombstone tokens that have gone quiet so the bookkeeping does
+            # not grow with every token the session has ever seen
+            if self._progress_last_sent:
+                cutoff = now - 2 * window
+                for token, last_sent in list(self._progress_last_sent.items()):
+                    if token not in self._pending_progress and last_sent < cutoff:
+                        del self._progress_last_sent[token]
+
+    async def set_logging_level(self, level: types.LoggingLevel) -> types.EmptyResult:
+        """Send a logging/setLevel request."""
+        return await self.send_request(
+            types.ClientRequest(
+                types.SetLevelRequest(
+                    method="logging/setLevel",
+                    params=types.SetLevelRequestParams(level=level),
+                )
+            ),
+            types.EmptyResult,
+        )
+
+    async def list_resources(self) -> types.ListResourcesResult:
+        """Send a resources/list request."""
+        return await self.send_requests_batched(
+            self._LIST_RESOURCES_REQ, types.ListResourcesResult
+        )
+
+    async def read_resource(self, uri: AnyUrl) -> types.ReadResourceResult:
+        """Send a resources/read request."""
+        return await self.send_requests_batched(
+            types.ClientRequest(
+                types.ReadResourceRequest(
+                    method="resources/read",
+                    params=types.ReadResourceRequestParams(uri=uri),
+                )
+            ),
+            types.ReadResourceResult,
+        )
+
+    async def subscribe_resource(self, uri: AnyUrl) -> types.EmptyResult:
+        """Send a resources/subscribe request."""
+        return await self.send_request(
+            types.ClientRequest(
+                types.SubscribeRequest(
+                    method="resources/subscribe",
+                    params=types.SubscribeRequestParams(uri=uri),
+                )
+            ),
+            types.EmptyResult,
+        )
+
+    async def unsubscribe_resource(self, uri: AnyUrl) -> types.EmptyResult:
+        """Send a resources/unsubscribe request."""
+        return await self.send_request(
+            types.ClientRequest(
+                types.UnsubscribeRequest(
+                    method="resources/unsubscribe",
+                    params=types.UnsubscribeRequestParams(uri=uri),
+                )
+            ),
+            types.EmptyResult,
+        )
+
+    async def call_tool(
+        self, name: str, arguments: dict | None = None
+    ) -> types.CallToolResult:
+        """Send a tools/call request."""
+        return await self.send_requests_batched(
+            types.ClientRequest(
+                types.CallToolRequest(
+                    method="tools/call",
+                    params=types.CallToolRequestParams(name=name, arguments=arguments),
+                )
+            ),
+            types.CallToolResult,
+        )
+
+    async def list_prompts(self) -> types.ListPromptsResult:
+        """Send a prompts/list request."""
+        return await self.send_requests_batched(
+            self._LIST_PROMPTS_REQ, types.ListPromptsResult
+        )
+
+    async def get_prompt(
+        self, name: str, arguments: dict[str, str] | None = None
+    ) -> types.GetPromptResult:
+        """Send a prompts/get request."""
+        return await self.send_requests_batched(
+            types.ClientRequest(
+                types.GetPromptRequest(
+                    method="prompts/get",
+                    params=types.GetPromptRequestParams(name=name, arguments=arguments),
+                )
+            ),
+            types.GetPromptResult,
+        )
+
+    async def complete(
+        self, ref: types.ResourceReference | types.PromptReference, argument: dict
+    ) -> types.CompleteResult:
+        """Send a completion/complete request."""
+        return await self.send_requests_batched(
+            types.ClientRequest(
+                types.CompleteRequest(
+                    method="completion/complete",
+                    params=types.CompleteRequestParams(
+                        ref=ref,
+                        argument=types.CompletionArgument(**argument),
+                    ),
+                )
+            ),
+            types.CompleteResult,
+        )
+
+    async def list_tools(self) -> types.ListToolsResult:
+        """Send a tools/list request."""
+        return await self.send_requests_batched(
+            self._LIST_TOOLS_REQ, types.ListToolsResult
+        )
+
+    async def send_roots_list_changed(self) -> None:
+        """Send a roots/list_changed notification."""
+        await self.send_notification(self._ROOTS_CHANGED_NOTIF)
+
+    async def _received_request(
+        self, responder: RequestResponder["types.ServerRequest", "types.ClientResult"]
+    ) -> None:
+        # deliberately leave the responder uncompleted; _receive_loop then
+        # forwards it to _handle_incoming, where requests are dispatched
+        pass
+
+    async def _handle_sampling_request(
+        self, responder: RequestResponder["types.ServerRequest", "types.ClientResult"]
+    ) -> None:
+        try:
+            # respond() requires the responder to be entered as a context
+            # manager, and entering marks it handled for _receive_loop
+            with responder:
+                try:
+                    response = await self.sample(responder.request.root.params)
+                except Exception as e:
+                    logger.exception(f"Error handling sampling request: {e}")
+                    # surface the failure instead of leaving the server
+                    # waiting on a response that will never arrive
+                    with anyio.CancelScope(shield=True):
+                        await responder.respond(
+                            types.ErrorData(code=types.INTERNAL_ERROR, message=str(e))
+                        )
+                    return
+
+                # the sampler already returned a validated CreateMessageResult,
+                # so wrap it without a model_dump/re-validate round trip
+                client_response = _client_result_construct(root=response)
+                # shield only the response write; session teardown should not
+                # have to wait out the whole LLM round trip
+                with anyio.CancelScope(shield=True):
+                    await responder.respond(client_response)
+        except Exception as e:
+            logger.exception(f"Error responding to sampling request: {e}")
+        finally:
+            self._sampling_semaphore.release()
+
+    async def sample(self, params: types.CreateMessageRequestParams) -> types.CreateMessageResult:
+        logger.info("got sampling request from mcp server")
+        resp = await handle_sampling_message(params)
+        logger.info("finished sampling request from mcp server")
+        return resp
     
\ No newline at end of file
@@ -133,11 +133,13 @@ class SseServerTransport:
             response = Response("Could not find session", status_code=404)
             return response
 
-        json = await request.json()
-        logger.debug(f"Received JSON: {json}")
+        body = await request.body()
+        logger.debug(f"Received body: {body!r}")
 
         try:
-            message = types.JSONRPCMessage.model_validate(json)
+            # decode straight from the raw bytes in one pydantic-core pass
+            # instead of json-parsing to a dict and validating that
+            message = types.JSONRPCMessage.model_validate_json(body)
             logger.debug(f"Validated client message: {message}")
         except ValidationError as err:
             logger.error(f"Failed to parse message: {err}")
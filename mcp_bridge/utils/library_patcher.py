@@ -6,6 +6,17 @@ import mcp.types
 from mcp.types import JSONRPCMessage
 from mcp.shared.message import SessionMessage
 
+try:
+    # optional fast path: orjson serializes roughly an order of magnitude
+    # faster than the stdlib for these message-sized payloads
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
 def patch_jsonrpc_message():
     """
     Patch the JSONRPCMessage class to add the 'message' property.
@@ -55,14 +66,14 @@ def patch_session_message():
         if hasattr(self.message, 'dict'):
             # Convert to dict then to JSON
             message_dict = self.message.dict(**kwargs)
-            return json.dumps(message_dict)
+            return _dumps(message_dict)
         
         # Fallback: try to convert to dict directly
         try:
-            return json.dumps(self.message.__dict__)
+            return _dumps(self.message.__dict__)
         except:
             # Last resort, just stringify
-            return json.dumps(str(self.message))
+            return _dumps(str(self.message))
     
     # Add the method to the class
     SessionMessage.model_dump_json = model_dump_json
@@ -36,7 +36,7 @@ def wrap_message(message: Any) -> Any:
     # No need to wrap if it's already a MessageWrapper
     if isinstance(message, MessageWrapper):
         return message
-        
+
     # Wrap the message
     return MessageWrapper(message)
 